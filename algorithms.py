@@ -1,35 +1,144 @@
-import math
+import heapq
+import re
 import numpy as np
 from collections import Counter
+from functools import lru_cache
+from typing import Iterable, Iterator
 from PIL import Image
 
 # =======================
 # RUN-LENGTH ENCODING (RLE)
 # =======================
-def rle_compress(text):
-    compressed = []
-    i = 0
-    while i < len(text):
-        count = 1
-        while i + 1 < len(text) and text[i] == text[i + 1]:
-            i += 1
-            count += 1
-        compressed.append(f"{text[i]}{count}")
-        i += 1
-    return ''.join(compressed)
+def rle_compress(data: bytes) -> bytes:
+    if not data:
+        return b""
+    # Run boundaries are found in a single C-level pass over the bytes
+    arr = np.frombuffer(data, dtype=np.uint8)
+    changes = np.flatnonzero(np.r_[True, arr[1:] != arr[:-1], True])
+    lengths = np.diff(changes)
+    values = arr[changes[:-1]]
+    return b"".join(b"%c%d" % (c, n) for c, n in zip(values.tolist(), lengths.tolist()))
 
-def rle_decompress(compressed):
-    decompressed = ""
-    i = 0
-    while i < len(compressed):
-        char = compressed[i]
-        i += 1
-        count = ""
-        while i < len(compressed) and compressed[i].isdigit():
-            count += compressed[i]
-            i += 1
-        decompressed += char * int(count)
-    return decompressed
+RLE_RUN = re.compile(rb"(.)(\d+)", re.DOTALL)
+
+def rle_decompress(compressed: bytes) -> bytes:
+    parts = []
+    pos = 0
+    for m in RLE_RUN.finditer(compressed):
+        if m.start() != pos:  # finditer skipped bytes that are not a run
+            break
+        parts.append(m[1] * int(m[2]))
+        pos = m.end()
+    if pos != len(compressed):
+        raise ValueError(f"Malformed RLE data at byte {pos}")
+    return b"".join(parts)
+
+# =======================
+# BIT I/O (MSB-first packing)
+# =======================
+class BitWriter:
+    __slots__ = ("buf", "acc", "nbits")
+
+    def __init__(self):
+        self.buf = bytearray()
+        self.acc = 0
+        self.nbits = 0
+
+    def write_bits(self, value: int, n: int):
+        self.acc = (self.acc << n) | value
+        self.nbits += n
+        if self.nbits >= 64:
+            self._flush()
+
+    def write_unary(self, q: int):
+        # q ones followed by a terminating zero
+        self.write_bits(((1 << q) - 1) << 1, q + 1)
+
+    def _flush(self):
+        nbytes = self.nbits >> 3
+        self.nbits &= 7
+        self.buf += (self.acc >> self.nbits).to_bytes(nbytes, "big")
+        self.acc &= (1 << self.nbits) - 1
+
+    def tell(self) -> int:
+        return (len(self.buf) << 3) + self.nbits
+
+    def getbytes(self) -> bytes:
+        # The last byte is zero-padded
+        pad = -self.nbits % 8
+        return bytes(self.buf) + (self.acc << pad).to_bytes((self.nbits + pad) >> 3, "big")
+
+class BitReader:
+    __slots__ = ("data", "pos", "acc", "nbits")
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.pos = 0
+        self.acc = 0
+        self.nbits = 0
+
+    def _refill(self, n: int):
+        while self.nbits < n:
+            chunk = self.data[self.pos:self.pos + 8]
+            if not chunk:
+                raise ValueError("Unexpected end of bitstream")
+            self.acc = (self.acc << (len(chunk) << 3)) | int.from_bytes(chunk, "big")
+            self.pos += len(chunk)
+            self.nbits += len(chunk) << 3
+
+    def read_bits(self, n: int) -> int:
+        if self.nbits < n:
+            self._refill(n)
+        self.nbits -= n
+        value = self.acc >> self.nbits
+        self.acc &= (1 << self.nbits) - 1
+        return value
+
+    def read_unary(self) -> int:
+        # The terminating zero is the highest set bit of the inverted accumulator,
+        # so a whole run of ones is consumed with one bit_length() call
+        q = 0
+        while True:
+            if not self.nbits:
+                self._refill(1)
+            zero = (self.acc ^ ((1 << self.nbits) - 1)).bit_length()
+            if zero:
+                q += self.nbits - zero
+                self.nbits = zero - 1
+                self.acc &= (1 << self.nbits) - 1
+                return q
+            q += self.nbits  # all ones so far
+            self.nbits = 0
+            self.acc = 0
+
+PACK_BLOCK = 1 << 16  # symbols per pack_codes block
+
+def pack_codes(symbols: np.ndarray, code_vals: np.ndarray, code_lens: np.ndarray) -> tuple[bytes, int]:
+    # Vectorised counterpart of BitWriter: gathers each symbol's (value, length) from
+    # the code tables, drops bit j of every code into its slot (one pass per code bit)
+    # and packs with np.packbits. Works in blocks of PACK_BLOCK symbols, carrying the
+    # unfinished trailing byte's bits forward, so memory stays bounded by the block.
+    out = bytearray()
+    carry = np.zeros(0, dtype=np.uint8)
+    nbits = 0
+    for pos in range(0, len(symbols), PACK_BLOCK):
+        block = symbols[pos:pos + PACK_BLOCK]
+        values = code_vals[block]
+        lengths = code_lens[block]
+        ends = np.cumsum(lengths, dtype=np.int64) + len(carry)
+        starts = ends - lengths
+        bits = np.empty(int(ends[-1]), dtype=np.uint8)
+        bits[:len(carry)] = carry
+        for j in range(int(lengths.max())):
+            sel = lengths > j
+            shift = (lengths[sel] - 1 - j).astype(np.uint64)
+            bits[starts[sel] + j] = (values[sel] >> shift) & 1
+        nbits += len(bits) - len(carry)
+        full = len(bits) & ~7
+        out += np.packbits(bits[:full]).tobytes()
+        carry = bits[full:].copy()
+    out += np.packbits(carry).tobytes()
+    return bytes(out), nbits
 
 # =======================
 # HUFFMAN CODING
@@ -44,18 +153,18 @@ class Node:
     def __lt__(self, other):
         return self.freq < other.freq
 
-def huffman_compress(text):
-    freq = Counter(text)
+def huffman_compress(data: bytes):
+    freq = Counter(data)
     heap = [Node(char, freq[char]) for char in freq]
+    heapq.heapify(heap)
 
     while len(heap) > 1:
-        heap.sort(key=lambda x: x.freq)
-        left = heap.pop(0)
-        right = heap.pop(0)
+        left = heapq.heappop(heap)
+        right = heapq.heappop(heap)
         merged = Node(None, left.freq + right.freq)
         merged.left = left
         merged.right = right
-        heap.append(merged)
+        heapq.heappush(heap, merged)
 
     root = heap[0]
     codes = {}
@@ -64,127 +173,273 @@ def huffman_compress(text):
         if node is None:
             return
         if node.char is not None:
-            codes[node.char] = current_code
+            codes[node.char] = current_code or "0"  # single-symbol input
         generate_codes(node.left, current_code + "0")
         generate_codes(node.right, current_code + "1")
 
     generate_codes(root)
-    encoded_text = ''.join(codes[ch] for ch in text)
-    return encoded_text, codes
-
-def huffman_decompress(encoded_text, codes):
-    reverse_codes = {v: k for k, v in codes.items()}
-    decoded_text = ""
-    temp = ""
-    for bit in encoded_text:
-        temp += bit
-        if temp in reverse_codes:
-            decoded_text += reverse_codes[temp]
-            temp = ""
-    return decoded_text
+    if max(len(code) for code in codes.values()) <= 64:
+        # Byte alphabet: 256-entry code tables turn encoding into array gathers
+        code_vals = np.zeros(256, dtype=np.uint64)
+        code_lens = np.zeros(256, dtype=np.uint8)
+        for byte, code in codes.items():
+            code_vals[byte] = int(code, 2)
+            code_lens[byte] = len(code)
+        arr = np.frombuffer(data, dtype=np.uint8)
+        encoded, nbits = pack_codes(arr, code_vals, code_lens)
+        return encoded, nbits, codes
+
+    # Extremely skewed inputs can produce codes too long for uint64
+    table = {byte: (int(code, 2), len(code)) for byte, code in codes.items()}
+    writer = BitWriter()
+    for byte in data:
+        writer.write_bits(*table[byte])
+    return writer.getbytes(), writer.tell(), codes
+
+def build_huffman_tree(codes):
+    root = Node(None, 0)
+    for char, code in codes.items():
+        node = root
+        for bit in code:
+            if bit == "0":
+                if node.left is None:
+                    node.left = Node(None, 0)
+                node = node.left
+            else:
+                if node.right is None:
+                    node.right = Node(None, 0)
+                node = node.right
+        node.char = char
+    return root
+
+@lru_cache(maxsize=8)
+def huffman_decode_table(code_items):
+    # Byte-at-a-time decoder: entry (state << 8) | byte holds the symbols completed
+    # while walking that byte's 8 bits from internal node `state`, and the node the
+    # walk ends on. Cached on the codes, so repeat decompressions skip the build.
+    root = build_huffman_tree(dict(code_items))
+    states = [root]
+    index = {id(root): 0}
+    emitted = []
+    next_state = []
+    i = 0
+    while i < len(states):
+        start = states[i]
+        for byte in range(256):
+            node = start
+            symbols = bytearray()
+            for shift in range(7, -1, -1):
+                node = node.right if (byte >> shift) & 1 else node.left
+                if node is None:  # not a valid code path
+                    break
+                if node.char is not None:
+                    symbols.append(node.char)
+                    node = root
+            if node is None:
+                emitted.append(None)
+                next_state.append(0)
+                continue
+            if id(node) not in index:
+                index[id(node)] = len(states)
+                states.append(node)
+            emitted.append(bytes(symbols))
+            next_state.append(index[id(node)])
+        i += 1
+    return states, emitted, next_state
+
+def huffman_decompress(encoded: bytes, codes, nbits: int) -> bytes:
+    decoded = bytearray()
+    if nbits < max(1, len(codes) - 1) * 4096:
+        # Short input: building the byte table (up to 256 entries per internal
+        # node) would cost more than it saves, so walk the tree bit by bit
+        root = node = build_huffman_tree(codes)
+        full = 0
+    else:
+        states, emitted, next_state = huffman_decode_table(tuple(codes.items()))
+        root = states[0]
+        full = nbits >> 3
+        state = 0
+        for byte in encoded[:full]:
+            i = (state << 8) | byte
+            symbols = emitted[i]
+            if symbols is None:
+                raise ValueError("Invalid Huffman bitstream")
+            decoded += symbols
+            state = next_state[i]
+        node = states[state]
+
+    # Remaining bits (all of them on the short path, else the final partial byte);
+    # slicing to nbits ignores the padding
+    tail = encoded[full:]
+    bits = format(int.from_bytes(tail, "big"), f"0{len(tail) * 8}b")[:nbits - full * 8]
+    try:
+        for bit in bits:
+            node = node.left if bit == "0" else node.right
+            if node.char is not None:
+                decoded.append(node.char)
+                node = root
+    except AttributeError:  # stepped off the tree: not a valid code path
+        raise ValueError("Invalid Huffman bitstream") from None
+    return bytes(decoded)
 
 # =======================
 # GOLOMB CODING
 # =======================
-def unary_encode(q: int) -> str:
-    return "1" * q + "0"
-
-def golomb_encode(n: int, m: int) -> str:
-    q = n // m
-    r = n % m
-    quotient_code = unary_encode(q)
-
-    if (m & (m - 1)) == 0:  # power of 2
-        k = int(math.log2(m))
-        remainder_code = format(r, f'0{k}b')
-    else:  # truncated binary
-        b = math.ceil(math.log2(m))
-        T = 2**b - m
-        if r < T:
-            remainder_code = format(r, f'0{b-1}b')
-        else:
-            remainder_code = format(r + T, f'0{b}b')
-    return quotient_code + remainder_code
-
-def unary_decode(code: str) -> (int, str): # type: ignore
-    q = 0
-    while code and code[0] == '1':
-        q += 1
-        code = code[1:]
-    if code and code[0] == '0':
-        code = code[1:]
-    return q, code
-
-def golomb_decode(code: str, m: int) -> int:
-    q, remaining_bits = unary_decode(code)
-    if (m & (m - 1)) == 0:
-        k = int(math.log2(m))
-        r_bits = remaining_bits[:k]
-        r = int(r_bits, 2)
+class GolombParams:
+    # Per-m constants, computed once and shared by every value in a batch
+    __slots__ = ("m", "b", "T")
+
+    def __init__(self, m: int):
+        self.m = m
+        self.b = max(1, (m - 1).bit_length())  # ceil(log2(m)), at least 1
+        # T == 0 when m is a power of two, so truncated binary degenerates to
+        # plain b-bit binary and no separate power-of-two path is needed
+        self.T = (1 << self.b) - m
+
+def unary_encode(q: int, writer: BitWriter):
+    writer.write_unary(q)
+
+def golomb_encode(n: int, params: GolombParams, writer: BitWriter):
+    q, r = divmod(n, params.m)
+
+    # Truncated binary
+    if r < params.T:
+        value, width = r, params.b - 1
+    else:
+        value, width = r + params.T, params.b
+
+    if q < 63:
+        # Unary prefix, terminator and remainder go out as one write
+        writer.write_bits((((1 << q) - 1) << (width + 1)) | value, q + 1 + width)
     else:
-        b = math.ceil(math.log2(m))
-        T = 2**b - m
-        r_bits = remaining_bits[:b-1]
-        r = int(r_bits, 2)
-        if r >= T:
-            r_bits = remaining_bits[:b]
-            r = int(r_bits, 2) - T
-    n = q * m + r
-    return n
+        unary_encode(q, writer)
+        writer.write_bits(value, width)
+
+def unary_decode(reader: BitReader) -> int:
+    return reader.read_unary()
+
+def golomb_decode(reader: BitReader, params: GolombParams) -> int:
+    q = unary_decode(reader)
+    r = reader.read_bits(params.b - 1)
+    if r >= params.T:
+        r = ((r << 1) | reader.read_bits(1)) - params.T
+    return q * params.m + r
+
+def golomb_encode_stream(numbers: Iterable[int], m: int, out: BitWriter) -> int:
+    # Consumes numbers lazily (no intermediate list) and returns how many were written
+    params = GolombParams(m)
+    count = 0
+    for n in numbers:
+        golomb_encode(n, params, out)
+        count += 1
+    return count
+
+def golomb_decode_stream(bitstream: bytes, m: int, count: int) -> Iterator[int]:
+    params = GolombParams(m)
+    reader = BitReader(bitstream)
+    for _ in range(count):
+        yield golomb_decode(reader, params)
+
+def golomb_parse_numbers(data: bytes) -> tuple[Iterator[int], int]:
+    # One integer per line, blank lines skipped. Values are parsed lazily, so a
+    # non-numeric line raises ValueError when the encoder reaches it
+    lines = [line for line in data.decode("utf-8").splitlines() if line.strip() != ""]
+    return map(int, lines), len(lines)
+
+def golomb_encode_batch(numbers: Iterable[int], m: int) -> bytes:
+    writer = BitWriter()
+    golomb_encode_stream(numbers, m, writer)
+    return writer.getbytes()
+
+def golomb_decode_batch(bitstream: bytes, m: int, count: int) -> list[int]:
+    return list(golomb_decode_stream(bitstream, m, count))
 
 # =======================
 # LZW CODING
 # =======================
-def lzw_compress(text):
-    dictionary = {chr(i): i for i in range(256)}  # map character to ASCII
-    next_code = 256
-    current_c = ""
+LZW_ESCAPE = 0
+
+def lzw_compress(data: bytes):
+    # The dictionary starts empty: code 0 is both the empty prefix and the escape.
+    # A byte seen for the first time is sent as (LZW_ESCAPE, byte) and only then
+    # gets a code, so codes stay small when few distinct bytes occur.
+    # Entries are keyed by (prefix_code << 8) | byte, so no string is ever built.
+    dictionary = {}
+    lookup = dictionary.get  # single probe on both hit and miss
+    next_code = 1
     result = []
 
-    for next_n in text:
-        combined = current_c + next_n
-        if combined in dictionary:
-            current_c = combined
-        else:
-            if current_c != "":
-                result.append(dictionary[current_c])
-            dictionary[combined] = next_code
+    current_code = 0
+    for byte in data:
+        key = (current_code << 8) | byte
+        code = lookup(key)
+        if code is not None:
+            current_code = code
+            continue
+
+        if current_code:
+            result.append(current_code)
+            dictionary[key] = next_code
             next_code += 1
-            current_c = next_n
+            code = lookup(byte)  # the single-byte entry, keyed (0 << 8) | byte
 
-    if current_c != "":
-        result.append(dictionary[current_c])
+        if code is None:
+            # Unseen byte: the escape carries it literally, so no prefix follows it
+            result.append(LZW_ESCAPE)
+            result.append(byte)
+            dictionary[byte] = next_code
+            next_code += 1
+            code = 0
+        current_code = code
 
+    if current_code:
+        result.append(current_code)
     return result
 
-def lzw_decompress(compressed_codes):
-    dictionary = {i: chr(i) for i in range(256)}
-    next_code = 256
+def lzw_decompress(compressed_codes) -> bytes:
+    # entries[code] holds the full bytes for each code; entry 0 is the empty string.
+    # A new entry is an existing one plus one byte, so building and emitting it are
+    # single C-level bytes operations rather than a per-byte chain walk.
+    entries = [b""]
+    out = bytearray()
 
-    prev_code = compressed_codes[0]
-    decoded = dictionary[prev_code]
-    result = [decoded]
+    prev = b""
+    codes = iter(compressed_codes)
+    for code in codes:
+        if code == LZW_ESCAPE:
+            byte = next(codes, None)
+            if byte is None:
+                raise ValueError("LZW escape is missing its byte")
+            entry = bytes((byte,))
+            if prev:
+                entries.append(prev + entry)
+            entries.append(entry)
+            out += entry
+            prev = b""
+            continue
 
-    for code in compressed_codes[1:]:
-        if code in dictionary:
-            entry = dictionary[code]
-        elif code == next_code:
-            entry = decoded + decoded[0]
+        if 0 < code < len(entries):
+            entry = entries[code]
+        elif code == len(entries) and prev:
+            entry = prev + prev[:1]  # entry is prev + its own first byte
         else:
             raise ValueError(f"Invalid LZW code: {code}")
 
-        result.append(entry)
-        dictionary[next_code] = decoded + entry[0]
-        next_code += 1
-        decoded = entry
-
-    return "".join(result)
+        if prev:
+            entries.append(prev + entry[:1])
+        out += entry
+        prev = entry
+    return bytes(out)
 
 # =======================
 # LOSSY IMAGE COMPRESSION (QUANTIZATION)
 # =======================
 def quantize_image(image: Image.Image, levels: int = 16) -> Image.Image:
     image = image.convert("L")  # Convert to grayscale
-    arr = np.array(image)
-    arr = (arr // (256 // levels)) * (256 // levels)
-    return Image.fromarray(arr.astype(np.uint8))
+    step = 256 // levels
+    if (step & (step - 1)) == 0:
+        # Rounding down to a power-of-two step is a single AND mask
+        arr = np.asarray(image)  # shares PIL's buffer; the mask writes a new array
+        return Image.fromarray(arr & np.uint8(-step & 0xFF))
+    # Other steps: a 256-entry lookup table applied natively by PIL
+    return image.point([(i // step) * step for i in range(256)])
@@ -3,12 +3,13 @@ from PIL import Image
 import io
 
 from algorithms import (
-    rle_compress, rle_decompress,
-    huffman_compress, huffman_decompress,
-    lzw_compress, lzw_decompress,
-    golomb_encode, golomb_decode,
+    rle_decompress,
+    huffman_decompress,
+    lzw_decompress,
+    golomb_decode_stream,
     quantize_image
 )
+from cached_algos import cached_rle, cached_huffman, cached_lzw, cached_golomb
 
 st.set_page_config(page_title="Data Compression App", page_icon="📦", layout="wide")
 st.title("📦 Data Compression Application")
@@ -54,11 +55,11 @@ if mode == "Lossless (Text)":
         type=["txt"]
     )
 
-    # Load text
+    # Load text as raw bytes; only the preview (and Golomb's number parsing) decodes it
     if uploaded_file:
-        text = uploaded_file.read().decode("utf-8").strip()
-        st.session_state.original_text = text
-        st.text_area("Original Text / Numbers", text, height=200)
+        data = uploaded_file.read().strip()
+        st.session_state.original_text = data
+        st.text_area("Original Text / Numbers", data.decode("utf-8", errors="replace"), height=200)
 
     # ===============================
     # OPERATION: COMPRESSION
@@ -68,21 +69,21 @@ if mode == "Lossless (Text)":
         if not st.session_state.original_text:
             st.warning("Please upload a text file first.")
         else:
-            text = st.session_state.original_text
+            data = st.session_state.original_text
 
             if technique == "Run-Length Encoding":
-                st.session_state.compressed = rle_compress(text)
+                st.session_state.compressed = cached_rle(data)
                 st.session_state.codes = None
                 st.session_state.lzw = None
 
             elif technique == "Huffman":
-                encoded, codes = huffman_compress(text)
+                encoded, nbits, codes = cached_huffman(data)
                 st.session_state.compressed = encoded
-                st.session_state.codes = codes
+                st.session_state.codes = (codes, nbits)
                 st.session_state.lzw = None
 
             elif technique == "LZW":
-                lst = lzw_compress(text)
+                lst = cached_lzw(data)
                 st.session_state.lzw = lst
                 st.session_state.compressed = lst
                 st.session_state.codes = None
@@ -90,25 +91,30 @@ if mode == "Lossless (Text)":
             elif technique == "Golomb":
                 # Treat each line as integer n
                 try:
-                    numbers = [int(line.strip()) for line in text.splitlines() if line.strip() != ""]
+                    encoded, count = cached_golomb(data, int(m))
                 except ValueError:
                     st.error("Golomb requires numbers only, one per line.")
                     st.stop()
-                encoded_list = [golomb_encode(n, m) for n in numbers]
-                st.session_state.compressed = encoded_list
-                st.session_state.codes = m
-
-            # Prepare display
-            compressed_display = "\n".join(st.session_state.compressed) if technique == "Golomb" else str(st.session_state.compressed)
+                st.session_state.compressed = encoded
+                st.session_state.codes = (m, count)
+
+            # Prepare display (Huffman/Golomb output is packed bits, shown one byte per group)
+            packed = technique in ("Huffman", "Golomb")
+            if packed:
+                compressed_display = " ".join(f"{byte:08b}" for byte in st.session_state.compressed)
+            elif technique == "Run-Length Encoding":
+                compressed_display = st.session_state.compressed.decode("utf-8", errors="replace")
+            else:
+                compressed_display = str(st.session_state.compressed)
             st.success("Compression Done Successfully!")
             st.text_area("🔒 Compressed Output", compressed_display, height=200)
 
             # Download compressed file
             st.download_button(
                 label="💾 Download Compressed File",
-                data="\n".join(st.session_state.compressed) if technique == "Golomb" else str(st.session_state.compressed),
-                file_name="compressed.txt",
-                mime="text/plain",
+                data=compressed_display if technique == "LZW" else st.session_state.compressed,
+                file_name="compressed.bin" if packed else "compressed.txt",
+                mime="application/octet-stream" if packed else "text/plain",
                 key="download_compressed"
             )
 
@@ -125,29 +131,35 @@ if mode == "Lossless (Text)":
                 st.session_state.decompressed = rle_decompress(st.session_state.compressed)
 
             elif technique == "Huffman":
+                codes, nbits = st.session_state.codes
                 st.session_state.decompressed = huffman_decompress(
                     st.session_state.compressed,
-                    st.session_state.codes
+                    codes,
+                    nbits
                 )
 
             elif technique == "LZW":
                 st.session_state.decompressed = lzw_decompress(st.session_state.lzw)
 
             elif technique == "Golomb":
-                m = st.session_state.codes
-                encoded_list = st.session_state.compressed
-                decoded_numbers = [golomb_decode(code, m) for code in encoded_list]
-                st.session_state.decompressed = decoded_numbers
+                m, count = st.session_state.codes
+                st.session_state.decompressed = "\n".join(
+                    map(str, golomb_decode_stream(st.session_state.compressed, m, count))
+                )
 
-            # Prepare display
-            decompressed_display = "\n".join(str(n) for n in st.session_state.decompressed) if technique == "Golomb" else str(st.session_state.decompressed)
+            # Prepare display (everything but Golomb decompresses to raw bytes)
+            decompressed = st.session_state.decompressed
+            if isinstance(decompressed, bytes):
+                decompressed_display = decompressed.decode("utf-8", errors="replace")
+            else:
+                decompressed_display = str(decompressed)
             st.success("Decompression Completed Successfully!")
             st.text_area("📤 Decompressed Output", decompressed_display, height=200)
 
             # Download decompressed file
             st.download_button(
                 label="💾 Download Decompressed File",
-                data="\n".join(str(n) for n in st.session_state.decompressed) if technique == "Golomb" else str(st.session_state.decompressed),
+                data=decompressed,
                 file_name="decompressed.txt",
                 mime="text/plain",
                 key="download_decompressed"
@@ -0,0 +1,31 @@
+import streamlit as st
+
+from algorithms import (
+    rle_compress,
+    huffman_compress,
+    lzw_compress,
+    golomb_parse_numbers, golomb_encode_batch,
+)
+
+# Streamlit hashes the arguments (raw upload bytes and parameters), so re-running
+# the page or re-clicking Compress on the same file returns the cached result.
+# max_entries bounds how many distinct uploads a long-running app keeps in memory.
+CACHE_ENTRIES = 8
+
+@st.cache_data(show_spinner=False, max_entries=CACHE_ENTRIES)
+def cached_rle(data: bytes) -> bytes:
+    return rle_compress(data)
+
+@st.cache_data(show_spinner=False, max_entries=CACHE_ENTRIES)
+def cached_huffman(data: bytes):
+    return huffman_compress(data)
+
+@st.cache_data(show_spinner=False, max_entries=CACHE_ENTRIES)
+def cached_lzw(data: bytes):
+    return lzw_compress(data)
+
+@st.cache_data(show_spinner=False, max_entries=CACHE_ENTRIES)
+def cached_golomb(data: bytes, m: int):
+    # Raises ValueError for non-numeric lines; exceptions are not cached
+    numbers, count = golomb_parse_numbers(data)
+    return golomb_encode_batch(numbers, m), count